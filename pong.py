@@ -1,15 +1,31 @@
 import math
 import random
 import sys
-from dataclasses import dataclass
-from typing import Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pygame
 
+# Hot-path aliases, bound once instead of resolved on every frame
+_K_W = pygame.K_w
+_K_S = pygame.K_s
+_K_ESCAPE = pygame.K_ESCAPE
+_K_SPACE = pygame.K_SPACE
+_QUIT = pygame.QUIT
+_KEYDOWN = pygame.KEYDOWN
+_REDRAW_EVENTS = frozenset((pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED))
+_event_get = pygame.event.get
+_get_pressed = pygame.key.get_pressed
 
 # ----- Configuration -----
 WIDTH, HEIGHT = 800, 600
-FPS = 120
+_HALF_W, _HALF_H = WIDTH // 2, HEIGHT // 2
+_HALF_H_F = HEIGHT / 2
+FPS = 120  # physics rate
+RENDER_FPS = 60  # render cap when the display's refresh rate cannot be queried
+PHYSICS_DT = 1.0 / FPS
+MAX_FRAME_TIME = 0.25  # seconds; avoids a burst of catch-up steps after a stall
 
 # Colors
 WHITE = (255, 255, 255)
@@ -30,17 +46,43 @@ BALL_MAX_SPEED = 720.0
 AI_REACTION_TIME = 0.12  # seconds
 AI_AIM_ERROR = 22  # pixels, base amplitude
 AI_RECENTER_SPEED = 200.0  # when ball is going away
+AI_PREDICTION_SAMPLES = 16  # noisy trajectories per reaction tick; the median is used
+AI_VELOCITY_NOISE = 22.0  # px/s, std dev of the vertical velocity in sampled trajectories
+AI_NOISE_BUFFER_SIZE = 4096  # must be a power of two
 
 SCORE_TO_WIN = 11
 
 
-@dataclass
+def _predict_y_batch(
+    px: float, py: float, vx: float, vy_arr: np.ndarray, target_x: float, ball_size: float, height: float
+) -> np.ndarray:
+    # Predict y positions when the ball reaches target_x for a batch of vertical
+    # velocities, simulating wall bounces in 1D vertical space
+    if vx == 0:
+        return np.full_like(vy_arr, py)
+
+    time_to_x = (target_x - px) / vx
+    if time_to_x <= 0:
+        return np.full_like(vy_arr, py)
+
+    projected_y = py + vy_arr * time_to_x
+    # Reflect off top/bottom walls using modular arithmetic
+    period = 2 * (height - ball_size)
+    y_mod = (projected_y - ball_size) % period
+    y_mod = np.where(y_mod > (height - ball_size), period - y_mod, y_mod)
+    return y_mod + ball_size / 2
+
+
+@dataclass(slots=True)
 class Paddle:
     x: int
     y: int
     width: int = PADDLE_WIDTH
     height: int = PADDLE_HEIGHT
     color: Tuple[int, int, int] = WHITE
+    # Set in __post_init__; declared so they get slots
+    rect: pygame.Rect = field(init=False, repr=False, compare=False)
+    velocity: float = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
@@ -49,6 +91,10 @@ class Paddle:
     def move_towards(self, target_y: float, max_speed: float, dt: float) -> None:
         center_y = self.rect.centery
         delta = target_y - center_y
+        if abs(delta) < 1.0:
+            # Already on target; the truncated step would be zero anyway
+            self.velocity = 0.0
+            return
         # Proportional control with clamp for fairness
         desired_speed = max(-max_speed, min(max_speed, 6.0 * delta))
         self.velocity = desired_speed
@@ -74,59 +120,94 @@ class Paddle:
         pygame.draw.rect(surface, self.color, self.rect)
 
 
-@dataclass
+@dataclass(slots=True)
 class Ball:
     x: int
     y: int
     size: int = BALL_SIZE
     color: Tuple[int, int, int] = WHITE
+    # Set in __post_init__; declared so they get slots
+    rect: pygame.Rect = field(init=False, repr=False, compare=False)
+    vel: pygame.Vector2 = field(init=False, repr=False, compare=False)
+    speed: float = field(init=False, repr=False, compare=False)
+    fx: float = field(init=False, repr=False, compare=False)
+    fy: float = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         self.rect = pygame.Rect(self.x, self.y, self.size, self.size)
-        self.vel = pygame.Vector2(BALL_SPEED, 0).rotate(random.uniform(-30, 30))
+        # Sub-pixel position; rect holds the truncated copy used for drawing and collisions
+        self.fx = float(self.x)
+        self.fy = float(self.y)
+        angle = math.radians(random.uniform(-30, 30))
+        self.vel = pygame.Vector2(BALL_SPEED * math.cos(angle), BALL_SPEED * math.sin(angle))
+        self.speed = BALL_SPEED  # tracked alongside vel to avoid recomputing its length
 
     def reset(self, direction: int) -> None:
-        self.rect.center = (WIDTH // 2, HEIGHT // 2)
-        angle = random.uniform(-30, 30)
-        self.vel = pygame.Vector2(direction * BALL_SPEED, 0).rotate(angle)
+        self.rect.center = (_HALF_W, _HALF_H)
+        self.fx = float(self.rect.x)
+        self.fy = float(self.rect.y)
+        angle = math.radians(random.uniform(-30, 30))
+        self.vel.x = direction * BALL_SPEED * math.cos(angle)
+        self.vel.y = BALL_SPEED * math.sin(angle)
+        self.speed = BALL_SPEED
 
     def update(self, dt: float) -> None:
+        rect = self.rect
+        vel = self.vel
+
         # Move
-        self.rect.x += int(self.vel.x * dt)
-        self.rect.y += int(self.vel.y * dt)
+        self.fx += vel.x * dt
+        self.fy += vel.y * dt
+        rect.x = int(self.fx)
+        rect.y = int(self.fy)
 
         # Top/bottom wall collision
-        if self.rect.top <= 0 and self.vel.y < 0:
-            self.rect.top = 0
-            self.vel.y *= -1
-        if self.rect.bottom >= HEIGHT and self.vel.y > 0:
-            self.rect.bottom = HEIGHT
-            self.vel.y *= -1
+        if rect.top <= 0 and vel.y < 0:
+            rect.top = 0
+            self.fy = float(rect.y)
+            vel.y = -vel.y
+        elif rect.bottom >= HEIGHT and vel.y > 0:
+            rect.bottom = HEIGHT
+            self.fy = float(rect.y)
+            vel.y = -vel.y
+
+    def collide_left_paddle(self, paddle: Paddle) -> bool:
+        if self._bounce_off(paddle, 1):
+            # Nudge the ball out of the paddle to prevent sticking
+            self.rect.left = paddle.rect.right
+            self.fx = float(self.rect.x)
+            return True
+        return False
 
-    def collide_paddle(self, paddle: Paddle) -> bool:
-        if self.rect.colliderect(paddle.rect):
-            # Determine hit position relative to paddle center to compute bounce angle
-            offset = (self.rect.centery - paddle.rect.centery) / (paddle.rect.height / 2)
-            offset = max(-1.0, min(1.0, offset))
+    def collide_right_paddle(self, paddle: Paddle) -> bool:
+        if self._bounce_off(paddle, -1):
+            # Nudge the ball out of the paddle to prevent sticking
+            self.rect.right = paddle.rect.left
+            self.fx = float(self.rect.x)
+            return True
+        return False
 
-            speed = min(self.vel.length() + BALL_SPEED_INCREMENT, BALL_MAX_SPEED)
+    def _bounce_off(self, paddle: Paddle, direction: int) -> bool:
+        # Reflect the ball so it travels in `direction` if it overlaps the paddle
+        br = self.rect
+        pr = paddle.rect
+        if not br.colliderect(pr):
+            return False
 
-            # Determine new angle: max 50 degrees off horizontal
-            max_angle = math.radians(50)
-            angle = offset * max_angle
+        # Determine hit position relative to paddle center to compute bounce angle
+        offset = (br.centery - pr.centery) / (pr.height / 2)
+        offset = max(-1.0, min(1.0, offset))
 
-            # Set direction based on side of the paddle
-            direction = 1 if paddle.rect.centerx < WIDTH // 2 else -1
-            self.vel.from_polar((speed, math.degrees(angle)))
-            self.vel.x = abs(self.vel.x) * direction
+        self.speed = min(self.speed + BALL_SPEED_INCREMENT, BALL_MAX_SPEED)
+        speed = self.speed
 
-            # Nudge the ball out of the paddle to prevent sticking
-            if direction > 0:
-                self.rect.left = paddle.rect.right
-            else:
-                self.rect.right = paddle.rect.left
-            return True
-        return False
+        # Determine new angle: max 50 degrees off horizontal
+        max_angle = math.radians(50)
+        angle = offset * max_angle
+
+        self.vel.x = direction * speed * math.cos(angle)
+        self.vel.y = speed * math.sin(angle)
+        return True
 
     def draw(self, surface: pygame.Surface) -> None:
         pygame.draw.rect(surface, self.color, self.rect)
@@ -138,13 +219,43 @@ class PongGame:
         pygame.display.set_caption("Pong - Pygame")
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         self.clock = pygame.time.Clock()
+        # Render at the display's refresh rate when pygame can report it (pygame 2.5.2
+        # cannot; pygame-ce and newer releases can), otherwise at RENDER_FPS
+        get_refresh_rate = getattr(pygame.display, "get_current_refresh_rate", None)
+        self._fps = (get_refresh_rate() if get_refresh_rate else 0) or RENDER_FPS
         self.font = pygame.font.SysFont("Consolas", 28)
         self.big_font = pygame.font.SysFont("Consolas", 48)
 
+        # Pre-rendered text and blit positions; scores are only rasterized the first
+        # time they are shown. Score entries hold the left-side position, which
+        # depends on the rendered width.
+        self._score_cache: Dict[int, Tuple[pygame.Surface, Tuple[int, int]]] = {}
+        self._win_cache: Dict[str, Tuple[pygame.Surface, Tuple[int, int]]] = {}
+        self._right_score_pos = (_HALF_W + 80, 24)
+        self._serve_text = self.font.render("Press SPACE to serve", True, GREY)
+        self._serve_pos = (_HALF_W - self._serve_text.get_width() // 2, _HALF_H - 40)
+
+        # Dashed middle line is static, so draw it once and blit it every frame
+        self._midline = pygame.Surface((4, HEIGHT), pygame.SRCALPHA)
+        for y in range(0, HEIGHT, 24):
+            pygame.draw.rect(self._midline, GREY, (0, y, 4, 12))
+        self._midline_pos = (_HALF_W - 2, 0)
+
         # Entities
-        self.player = Paddle(MARGIN, HEIGHT // 2 - PADDLE_HEIGHT // 2)
-        self.ai = Paddle(WIDTH - MARGIN - PADDLE_WIDTH, HEIGHT // 2 - PADDLE_HEIGHT // 2)
-        self.ball = Ball(WIDTH // 2 - BALL_SIZE // 2, HEIGHT // 2 - BALL_SIZE // 2)
+        self.player = Paddle(MARGIN, _HALF_H - PADDLE_HEIGHT // 2)
+        self.ai = Paddle(WIDTH - MARGIN - PADDLE_WIDTH, _HALF_H - PADDLE_HEIGHT // 2)
+        self.ball = Ball(_HALF_W - BALL_SIZE // 2, _HALF_H - BALL_SIZE // 2)
+
+        # Dirty-rect rendering: static layers live on a background surface that is
+        # rebuilt only when the score/serve state changes; each frame just restores it
+        # under last frame's entity rects and redraws the entities.
+        self._background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        # The entity rects are mutated in place, never replaced, so the rect lists
+        # are built once here and no rects are allocated per frame.
+        self._entity_rects = (self.player.rect, self.ai.rect, self.ball.rect)
+        self._prev_rects: List[pygame.Rect] = [rect.copy() for rect in self._entity_rects]
+        self._dirty_rects: List[pygame.Rect] = self._prev_rects + list(self._entity_rects)
+        self._shown_state: Optional[Tuple[int, int, bool]] = None
 
         # Game state
         self.left_score = 0
@@ -154,44 +265,55 @@ class PongGame:
 
         # AI state
         self.ai_timer = 0.0
-        self.ai_target_y = HEIGHT // 2
+        self.ai_target_y = _HALF_H
         self.ai_error = 0.0
         self.ai_error_timer = 0.0
+        self._rng = np.random.default_rng()
+        # Aim offsets are drawn up front and cycled through instead of sampled per tick
+        self._noise = [random.uniform(-AI_AIM_ERROR, AI_AIM_ERROR) for _ in range(AI_NOISE_BUFFER_SIZE)]
+        self._noise_i = 0
 
     def run(self) -> None:
+        # Fixed-step physics at FPS, decoupled from the render rate
+        accumulator = 0.0
         while True:
-            dt = self.clock.tick(FPS) / 1000.0
+            accumulator += min(self.clock.tick(self._fps) / 1000.0, MAX_FRAME_TIME)
             if not self.handle_events():
                 break
-            self.update(dt)
+            while accumulator >= PHYSICS_DT:
+                self.update(PHYSICS_DT)
+                accumulator -= PHYSICS_DT
             self.draw()
 
         pygame.quit()
         sys.exit(0)
 
     def handle_events(self) -> bool:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        for event in _event_get():
+            if event.type == _QUIT:
                 return False
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
+            if event.type == _KEYDOWN:
+                if event.key == _K_ESCAPE:
                     return False
-                if event.key == pygame.K_SPACE and self.waiting_for_serve:
+                if event.key == _K_SPACE and self.waiting_for_serve:
                     self.ball.reset(self.serving_dir)
                     self.waiting_for_serve = False
+            elif event.type in _REDRAW_EVENTS:
+                # Window contents may be stale; force a full repaint next frame
+                self._shown_state = None
         return True
 
     def update(self, dt: float) -> None:
-        keys = pygame.key.get_pressed()
-        self.player.player_input(keys[pygame.K_w], keys[pygame.K_s], dt)
+        keys = _get_pressed()
+        self.player.player_input(keys[_K_W], keys[_K_S], dt)
 
         if not self.waiting_for_serve:
             self.ball.update(dt)
             # Collisions
-            hit_left = self.ball.collide_paddle(self.player)
-            hit_right = self.ball.collide_paddle(self.ai)
+            hit_left = self.ball.collide_left_paddle(self.player)
+            hit_right = self.ball.collide_right_paddle(self.ai)
             if hit_left or hit_right:
-                pass  # handled in collide_paddle
+                pass  # handled in collide_left_paddle/collide_right_paddle
 
             # Goals
             if self.ball.rect.right < 0:
@@ -211,7 +333,8 @@ class PongGame:
         self.ai_error_timer += dt
         if self.ai_error_timer >= 0.6:
             self.ai_error_timer = 0.0
-            self.ai_error = random.uniform(-AI_AIM_ERROR, AI_AIM_ERROR)
+            self._noise_i = (self._noise_i + 1) & (AI_NOISE_BUFFER_SIZE - 1)
+            self.ai_error = self._noise[self._noise_i]
 
         ball_moving_towards_ai = self.ball.vel.x > 0
         self.ai_timer += dt
@@ -220,65 +343,83 @@ class PongGame:
             # Only adjust target after reaction time elapsed
             if self.ai_timer >= AI_REACTION_TIME:
                 self.ai_timer = 0.0
-                # Predict where the ball will be when it reaches AI's x using simple reflection prediction
-                predicted_y = self.predict_ball_y_at_x(self.ai.rect.centerx)
+                # Predict where the ball will be when it reaches AI's x over a few noisy trajectories
+                predicted_y = self.sample_ball_y_at_x(self.ai.rect.centerx)
                 self.ai_target_y = predicted_y + self.ai_error
             # Move towards target with capped speed
             self.ai.move_towards(self.ai_target_y, AI_MAX_SPEED, dt)
         else:
             # Recenter slowly when ball is moving away or during serve
-            self.ai.move_towards(HEIGHT / 2, AI_RECENTER_SPEED, dt)
-
-    def predict_ball_y_at_x(self, target_x: int) -> float:
-        # Predict y position when ball reaches target_x, simulating wall bounces in 1D vertical space
-        pos = pygame.Vector2(self.ball.rect.center)
-        vel = self.ball.vel.copy()
-        if vel.x == 0:
-            return pos.y
-
-        time_to_x = (target_x - pos.x) / vel.x
-        if time_to_x <= 0:
-            return pos.y
-
-        projected_y = pos.y + vel.y * time_to_x
-        # Reflect off top/bottom walls using modular arithmetic
-        period = 2 * (HEIGHT - self.ball.size)
-        y_mod = (projected_y - self.ball.size) % period
-        if y_mod > (HEIGHT - self.ball.size):
-            y_mod = period - y_mod
-        return y_mod + self.ball.size / 2
-
-    def draw(self) -> None:
-        self.screen.fill(BLACK)
+            self.ai.move_towards(_HALF_H_F, AI_RECENTER_SPEED, dt)
+
+    def sample_ball_y_at_x(self, target_x: int) -> float:
+        # Median landing point over trajectories with a perturbed vertical velocity
+        px, py = self.ball.rect.center
+        vy_arr = self.ball.vel.y + self._rng.normal(0.0, AI_VELOCITY_NOISE, AI_PREDICTION_SAMPLES)
+        predicted = _predict_y_batch(
+            float(px), float(py), self.ball.vel.x, vy_arr,
+            float(target_x), float(self.ball.size), float(HEIGHT),
+        )
+        return float(np.median(predicted))
+
+    def _score_text(self, score: int) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        entry = self._score_cache.get(score)
+        if entry is None:
+            surface = self.big_font.render(str(score), True, WHITE)
+            entry = self._score_cache[score] = (surface, (_HALF_W - 80 - surface.get_width(), 24))
+        return entry
+
+    def _win_text(self, winner: str) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        entry = self._win_cache.get(winner)
+        if entry is None:
+            surface = self.big_font.render(f"{winner} Wins!", True, WHITE)
+            entry = self._win_cache[winner] = (surface, (_HALF_W - surface.get_width() // 2, _HALF_H - 12))
+        return entry
+
+    def _draw_background(self) -> None:
+        # Everything that only changes with the score/serve state
+        bg = self._background
+        bg.fill(BLACK)
 
         # Middle line
-        for y in range(0, HEIGHT, 24):
-            pygame.draw.rect(self.screen, GREY, (WIDTH // 2 - 2, y, 4, 12))
-
-        # Draw entities
-        self.player.draw(self.screen)
-        self.ai.draw(self.screen)
-        self.ball.draw(self.screen)
+        bg.blit(self._midline, self._midline_pos)
 
         # Scores
-        left_text = self.big_font.render(str(self.left_score), True, WHITE)
-        right_text = self.big_font.render(str(self.right_score), True, WHITE)
-        self.screen.blit(left_text, (WIDTH // 2 - 80 - left_text.get_width(), 24))
-        self.screen.blit(right_text, (WIDTH // 2 + 80, 24))
+        bg.blit(*self._score_text(self.left_score))
+        bg.blit(self._score_text(self.right_score)[0], self._right_score_pos)
 
         # Serve/help text
         if self.waiting_for_serve:
-            msg = "Press SPACE to serve"
-            serve_text = self.font.render(msg, True, GREY)
-            self.screen.blit(serve_text, (WIDTH // 2 - serve_text.get_width() // 2, HEIGHT // 2 - 40))
+            bg.blit(self._serve_text, self._serve_pos)
 
         # Win condition
         if self.left_score >= SCORE_TO_WIN or self.right_score >= SCORE_TO_WIN:
             winner = "Player" if self.left_score > self.right_score else "AI"
-            win_text = self.big_font.render(f"{winner} Wins!", True, WHITE)
-            self.screen.blit(win_text, (WIDTH // 2 - win_text.get_width() // 2, HEIGHT // 2 - 12))
+            bg.blit(*self._win_text(winner))
 
-        pygame.display.flip()
+    def draw(self) -> None:
+        state = (self.left_score, self.right_score, self.waiting_for_serve)
+        full_redraw = state != self._shown_state
+        if full_redraw:
+            self._draw_background()
+            self._shown_state = state
+            self.screen.blit(self._background, (0, 0))
+        else:
+            # Erase entities by restoring the background where they were last frame
+            for rect in self._prev_rects:
+                self.screen.blit(self._background, rect, rect)
+
+        # Draw entities
+        self.player.draw(self.screen)
+        self.ai.draw(self.screen)
+        self.ball.draw(self.screen)
+
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._dirty_rects)
+        for prev, rect in zip(self._prev_rects, self._entity_rects):
+            prev.update(rect)
 
 
 if __name__ == "__main__":